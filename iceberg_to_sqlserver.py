@@ -3,18 +3,55 @@
 Iceberg to SQL Server Data Ingestion Script
 
 Reads data from Apache Iceberg tables and ingests it into Microsoft SQL Server.
-Configuration is provided via a YAML config file or command-line arguments.
+Configuration is provided via a YAML (or JSON) config file or command-line arguments.
 """
 
 import argparse
+import contextlib
+import functools
+import itertools
+import json
 import logging
+import multiprocessing
+import os
+import queue
+import re
 import sys
+import tempfile
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 import pymssql
 import yaml
+from pymssql import _mssql
 from pyiceberg.catalog import load_catalog
+from pyiceberg.expressions import AlwaysTrue
+from pyiceberg.expressions.parser import parse as parse_row_filter
+from pyiceberg.io.pyarrow import ArrowScan, schema_to_pyarrow
+
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml-backed, much faster
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    import pyodbc
+except ImportError:  # pyodbc is only needed for `driver: pyodbc`
+    pyodbc = None
+
+# Driver errors that trigger a fallback to a slower insert path
+DB_ERRORS = (pymssql.Error, _mssql.MSSQLException) + ((pyodbc.Error,) if pyodbc is not None else ())
+
+# bulk_copy also raises these when it cannot convert a Python value for BCP
+BULK_COPY_ERRORS = DB_ERRORS + (TypeError, ValueError, OverflowError)
+
+# Staging a BULK INSERT file can also fail locally (unwritable directory, CSV writer)
+BULK_INSERT_ERRORS = DB_ERRORS + (OSError, pa.ArrowException)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -23,46 +60,53 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Mapping from Iceberg/PyArrow types to SQL Server types
+# Fixed-width PyArrow types (by str(type)) to SQL Server types. Other types
+# are dispatched on pa.types predicates in arrow_type_to_sql.
 ICEBERG_TO_SQL_TYPE_MAP = {
     "bool": "BIT",
-    "int8": "TINYINT",
+    "int8": "SMALLINT",  # TINYINT is unsigned
     "int16": "SMALLINT",
     "int32": "INT",
     "int64": "BIGINT",
-    "uint8": "SMALLINT",
+    "uint8": "TINYINT",
     "uint16": "INT",
     "uint32": "BIGINT",
-    "uint64": "BIGINT",
-    "float16": "REAL",
-    "float32": "REAL",
+    "uint64": "DECIMAL(20, 0)",  # exceeds BIGINT
+    "halffloat": "REAL",
     "float": "REAL",
-    "float64": "FLOAT",
     "double": "FLOAT",
-    "decimal128": "DECIMAL",
-    "date32": "DATE",
-    "date64": "DATE",
-    "timestamp": "DATETIME2",
-    "time32": "TIME",
-    "time64": "TIME",
-    "string": "NVARCHAR(MAX)",
-    "large_string": "NVARCHAR(MAX)",
-    "utf8": "NVARCHAR(MAX)",
-    "large_utf8": "NVARCHAR(MAX)",
-    "binary": "VARBINARY(MAX)",
-    "large_binary": "VARBINARY(MAX)",
-    "fixed_size_binary": "VARBINARY(MAX)",
 }
 
+# SQL Server accepts at most 1000 row value expressions per INSERT ... VALUES
+MAX_VALUES_ROWS = 1000
+
+# Arrow prints decimals with a larger scale in exponent form (e.g. 1E-7),
+# which SQL Server will not convert to DECIMAL
+MAX_PLAIN_DECIMAL_SCALE = 6
+
+# SQL Server DECIMAL precision limit
+MAX_DECIMAL_PRECISION = 38
+
+# Largest non-MAX sizes for NVARCHAR(n) / VARBINARY(n) columns
+MAX_NVARCHAR_LENGTH = 4000
+MAX_VARBINARY_LENGTH = 8000
+
+# TDS packet size limits accepted by SQL Server (default is 4096)
+MIN_PACKET_SIZE = 512
+MAX_PACKET_SIZE = 32767
+
 
 def load_config(config_path: str) -> dict:
-    """Load configuration from a YAML file."""
+    """Load configuration from a YAML file, or a JSON file if it ends in .json."""
     path = Path(config_path)
     if not path.exists():
         logger.error("Config file not found: %s", config_path)
         sys.exit(1)
     with open(path) as f:
-        config = yaml.safe_load(f)
+        if path.suffix.lower() == ".json":
+            config = json.load(f)
+        else:
+            config = yaml.load(f, Loader=SafeLoader)
     logger.info("Loaded config from %s", config_path)
     return config
 
@@ -85,168 +129,991 @@ def get_iceberg_table(config: dict):
     return table
 
 
-def arrow_type_to_sql(arrow_type) -> str:
-    """Convert a PyArrow type to SQL Server column type."""
-    type_str = str(arrow_type).lower()
+@functools.lru_cache(maxsize=256)
+def arrow_type_to_sql(arrow_type, max_len: int = None) -> str:
+    """Convert a PyArrow type to SQL Server column type.
 
-    # Handle parameterized types
-    if type_str.startswith("decimal"):
-        # Extract precision and scale from e.g. decimal128(10, 2)
-        import re
-        match = re.search(r"decimal\d*\((\d+),\s*(\d+)\)", type_str)
-        if match:
-            return f"DECIMAL({match.group(1)}, {match.group(2)})"
-        return "DECIMAL(38, 18)"
-
-    if "timestamp" in type_str:
+    max_len sizes string/binary columns (see string_column_sizes); without
+    it they map to NVARCHAR(MAX) / VARBINARY(MAX).
+    """
+    # Dispatch common types on the Arrow type itself; no str() per field
+    if pa.types.is_timestamp(arrow_type):
         return "DATETIME2"
-    if "date" in type_str:
+    if pa.types.is_decimal(arrow_type):
+        if arrow_type.precision > MAX_DECIMAL_PRECISION:
+            logger.warning("%s exceeds SQL Server's DECIMAL precision; using 38.", arrow_type)
+            return f"DECIMAL({MAX_DECIMAL_PRECISION}, {min(arrow_type.scale, MAX_DECIMAL_PRECISION)})"
+        return f"DECIMAL({arrow_type.precision}, {arrow_type.scale})"
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return f"NVARCHAR({max_len})" if max_len else "NVARCHAR(MAX)"
+    if pa.types.is_binary(arrow_type) or pa.types.is_large_binary(arrow_type):
+        return f"VARBINARY({max_len})" if max_len else "VARBINARY(MAX)"
+    if pa.types.is_fixed_size_binary(arrow_type):
+        if arrow_type.byte_width <= MAX_VARBINARY_LENGTH:
+            return f"BINARY({arrow_type.byte_width})"
+        return "VARBINARY(MAX)"
+    if pa.types.is_date(arrow_type):
         return "DATE"
-    if "time" in type_str:
+    if pa.types.is_time(arrow_type):
         return "TIME"
-    if "list" in type_str or "struct" in type_str or "map" in type_str:
-        return "NVARCHAR(MAX)"
+    if pa.types.is_nested(arrow_type):
+        return "NVARCHAR(MAX)"  # serialized as JSON on insert
+    if pa.types.is_dictionary(arrow_type):
+        return arrow_type_to_sql(arrow_type.value_type, max_len)
 
-    for key, sql_type in ICEBERG_TO_SQL_TYPE_MAP.items():
-        if key in type_str:
-            return sql_type
+    sql_type = ICEBERG_TO_SQL_TYPE_MAP.get(str(arrow_type))
+    if sql_type is not None:
+        return sql_type
 
-    logger.warning("Unknown Arrow type '%s', defaulting to NVARCHAR(MAX)", type_str)
+    logger.warning("Unknown Arrow type '%s', defaulting to NVARCHAR(MAX)", arrow_type)
     return "NVARCHAR(MAX)"
 
 
+def quote_identifier(name: str) -> str:
+    """Bracket-quote a SQL Server identifier, escaping embedded ']'."""
+    return "[" + name.replace("]", "]]") + "]"
+
+
+def qualified_name(schema_name: str, table_name: str) -> str:
+    """Return the bracket-quoted [schema].[table] name."""
+    return f"{quote_identifier(schema_name)}.{quote_identifier(table_name)}"
+
+
+def _odbc_connection_string(sql_cfg: dict) -> str:
+    """Build an ODBC connection string for the pyodbc driver."""
+    def quote(value) -> str:
+        # Braces protect values containing ';' or other ODBC delimiters
+        return "{" + str(value).replace("}", "}}") + "}"
+
+    parts = [
+        f"DRIVER={{{sql_cfg.get('odbc_driver', 'ODBC Driver 18 for SQL Server')}}}",
+        f"SERVER={sql_cfg['host']},{sql_cfg.get('port', 1433)}",
+        f"DATABASE={quote(sql_cfg['database'])}",
+        f"UID={quote(sql_cfg['user'])}",
+        f"PWD={quote(sql_cfg['password'])}",
+    ]
+    if sql_cfg.get("trust_server_certificate", False):
+        parts.append("TrustServerCertificate=yes")
+    if sql_cfg.get("packet_size"):
+        parts.append(f"Packet Size={sql_cfg['packet_size']}")
+    if sql_cfg.get("keepalive"):
+        parts.append(f"KeepAlive={int(sql_cfg['keepalive'])}")
+    return ";".join(parts) + ";"
+
+
+def _packet_size(sql_cfg: dict):
+    """Return the configured TDS packet size, or None for the driver default."""
+    size = sql_cfg.get("packet_size")
+    if size is None:
+        return None
+    if not isinstance(size, int) or not MIN_PACKET_SIZE <= size <= MAX_PACKET_SIZE:
+        logger.error(
+            "packet_size must be an integer between %d and %d, got %r.",
+            MIN_PACKET_SIZE, MAX_PACKET_SIZE, size,
+        )
+        sys.exit(1)
+    return size
+
+
 def connect_sql_server(config: dict):
-    """Create a connection to SQL Server."""
+    """Create a connection to SQL Server using the configured driver."""
     sql_cfg = config["sql_server"]
+    driver = sql_cfg.get("driver", "pymssql")
+    packet_size = _packet_size(sql_cfg)
     logger.info(
-        "Connecting to SQL Server %s:%s, database: %s",
+        "Connecting to SQL Server %s:%s, database: %s (driver: %s)",
         sql_cfg["host"],
         sql_cfg.get("port", 1433),
         sql_cfg["database"],
+        driver,
     )
-    conn = pymssql.connect(
-        server=sql_cfg["host"],
-        port=sql_cfg.get("port", 1433),
-        user=sql_cfg["user"],
-        password=sql_cfg["password"],
-        database=sql_cfg["database"],
-    )
+    if driver == "pyodbc":
+        if pyodbc is None:
+            logger.error("driver 'pyodbc' requested but pyodbc is not installed.")
+            sys.exit(1)
+        conn = pyodbc.connect(_odbc_connection_string(sql_cfg))
+    elif driver == "pymssql":
+        conn = pymssql.connect(
+            server=sql_cfg["host"],
+            port=sql_cfg.get("port", 1433),
+            user=sql_cfg["user"],
+            password=sql_cfg["password"],
+            database=sql_cfg["database"],
+            tds_version=sql_cfg.get("tds_version"),
+            use_datetime2=True,  # keep microseconds when binding datetime parameters
+        )
+        if packet_size:
+            # FreeTDS negotiates the packet size at login and pymssql has no
+            # option for it, so it can only come from freetds.conf
+            logger.warning(
+                "pymssql cannot set packet_size; set 'packet size = %d' in freetds.conf instead.",
+                packet_size,
+            )
+    else:
+        logger.error("Unknown SQL Server driver '%s' (expected 'pymssql' or 'pyodbc').", driver)
+        sys.exit(1)
     logger.info("Connected to SQL Server successfully.")
     return conn
 
 
-def create_table_if_needed(conn, schema_name: str, table_name: str, arrow_schema, drop_existing: bool = False):
-    """Create the target SQL Server table based on the Arrow schema."""
+def _placeholder(conn) -> str:
+    """Return the DB-API parameter marker for the connection's driver."""
+    if pyodbc is not None and isinstance(conn, pyodbc.Connection):
+        return "?"
+    return "%s"
+
+
+def _pyodbc_input_sizes(arrow_schema, column_sizes: dict = None) -> list:
+    """Build cursor.setinputsizes() hints for pyodbc from the Arrow schema.
+
+    String and binary columns bind with their sized length where known; 0
+    binds them as (MAX).
+    """
+    column_sizes = column_sizes or {}
+    sizes = []
+    for field in arrow_schema:
+        arrow_type = field.type
+        max_len = column_sizes.get(field.name) or 0
+        if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+            sizes.append((pyodbc.SQL_WVARCHAR, max_len, 0))
+        elif pa.types.is_binary(arrow_type) or pa.types.is_large_binary(arrow_type):
+            sizes.append((pyodbc.SQL_VARBINARY, max_len, 0))
+        elif _decimal_as_text(arrow_type):
+            # Bound as text (see _cast_to_text): digits, sign, point and
+            # the leading zero Arrow prints when scale == precision
+            sizes.append((pyodbc.SQL_VARCHAR, arrow_type.precision + 3, 0))
+        elif pa.types.is_decimal(arrow_type):
+            sizes.append((pyodbc.SQL_DECIMAL, arrow_type.precision, arrow_type.scale))
+        elif pa.types.is_uint64(arrow_type):
+            sizes.append((pyodbc.SQL_VARCHAR, 20, 0))  # bound as text, see COLUMN_CONVERTERS
+        else:
+            # Let pyodbc infer the remaining types from the bound values
+            sizes.append(None)
+    return sizes
+
+
+def _round_column_size(max_len, cap: int):
+    """Round a measured max length up to a power of two, or None (MAX) above cap."""
+    if max_len is None or max_len > cap:
+        return None
+    return min(1 << max(max_len - 1, 0).bit_length(), cap)
+
+
+def string_column_sizes(arrow_table) -> dict:
+    """Measure string/binary columns and return {column: size or None for MAX}.
+
+    String lengths are measured in UTF-8 bytes, an upper bound on the UTF-16
+    code units NVARCHAR(n) counts, so a sized column never truncates.
+    """
+    sizes = {}
+    for field, column in zip(arrow_table.schema, arrow_table.columns):
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            cap = MAX_NVARCHAR_LENGTH
+        elif pa.types.is_binary(field.type) or pa.types.is_large_binary(field.type):
+            cap = MAX_VARBINARY_LENGTH
+        else:
+            continue
+        max_len = pc.max(pc.binary_length(column)).as_py()
+        sizes[field.name] = _round_column_size(max_len, cap)
+    return sizes
+
+
+def create_table_if_needed(conn, schema_name: str, table_name: str, arrow_schema, drop_existing: bool = False,
+                           column_sizes: dict = None):
+    """Create the target SQL Server table based on the Arrow schema.
+
+    column_sizes (from string_column_sizes) sizes string/binary columns.
+    """
+    column_sizes = column_sizes or {}
     cursor = conn.cursor()
+    marker = _placeholder(conn)
 
-    full_name = f"[{schema_name}].[{table_name}]"
+    full_name = qualified_name(schema_name, table_name)
 
-    # Ensure schema exists
+    # Ensure schema exists; names are bound as parameters so the plan is reusable
     cursor.execute(
-        f"IF NOT EXISTS (SELECT 1 FROM sys.schemas WHERE name = %s) "
-        f"EXEC('CREATE SCHEMA [{schema_name}]')",
+        f"DECLARE @schema sysname = {marker}; "
+        "IF NOT EXISTS (SELECT 1 FROM sys.schemas WHERE name = @schema) "
+        "BEGIN "
+        "DECLARE @sql nvarchar(max) = N'CREATE SCHEMA ' + QUOTENAME(@schema); "
+        "EXEC sp_executesql @sql "
+        "END",
         (schema_name,),
     )
 
-    if drop_existing:
-        logger.info("Dropping existing table %s if it exists.", full_name)
-        cursor.execute(f"IF OBJECT_ID('{schema_name}.{table_name}', 'U') IS NOT NULL DROP TABLE {full_name}")
+    cursor.execute(f"SELECT OBJECT_ID({marker}, 'U')", (full_name,))
+    exists = cursor.fetchone()[0] is not None
+
+    if drop_existing and exists:
+        logger.info("Dropping existing table %s.", full_name)
+        cursor.execute(f"DROP TABLE {full_name}")
+        exists = False
 
     columns = []
     for field in arrow_schema:
-        sql_type = arrow_type_to_sql(field.type)
+        sql_type = arrow_type_to_sql(field.type, column_sizes.get(field.name))
         nullable = "NULL" if field.nullable else "NOT NULL"
-        columns.append(f"    [{field.name}] {sql_type} {nullable}")
+        columns.append(f"    {quote_identifier(field.name)} {sql_type} {nullable}")
 
     columns_sql = ",\n".join(columns)
     create_sql = f"""
-IF NOT EXISTS (SELECT 1 FROM INFORMATION_SCHEMA.TABLES
-               WHERE TABLE_SCHEMA = '{schema_name}' AND TABLE_NAME = '{table_name}')
-BEGIN
-    CREATE TABLE {full_name} (
+CREATE TABLE {full_name} (
 {columns_sql}
-    )
-END
+)
 """
-    logger.info("Ensuring table %s exists.", full_name)
-    logger.debug("CREATE TABLE SQL:\n%s", create_sql)
-    cursor.execute(create_sql)
+    if exists:
+        logger.info("Table %s already exists.", full_name)
+    else:
+        logger.info("Creating table %s.", full_name)
+        logger.debug("CREATE TABLE SQL:\n%s", create_sql)
+        cursor.execute(create_sql)
     conn.commit()
     logger.info("Table %s is ready.", full_name)
 
 
-def ingest_data(conn, schema_name: str, table_name: str, arrow_table, batch_size: int = 1000):
-    """Insert data from a PyArrow Table into SQL Server in batches."""
+def _timestamp_to_pylist(column) -> list:
+    """Cast to naive microseconds in C++ so to_pylist() yields datetime.datetime.
+
+    tz-aware values are kept as UTC wall-clock time, so pyodbc binds them
+    into DATETIME2 without renormalizing to the client's time zone.
+    """
+    return pc.cast(column, pa.timestamp("us"), safe=False).to_pylist()
+
+
+def _decimal_as_text(arrow_type) -> bool:
+    """Whether Arrow renders this decimal type as plain (non-exponent) text."""
+    return pa.types.is_decimal(arrow_type) and 0 <= arrow_type.scale <= MAX_PLAIN_DECIMAL_SCALE
+
+
+def _cast_to_text(column) -> list:
+    """Render values as strings in C++; SQL Server converts them on bind."""
+    return pc.cast(column, pa.string()).to_pylist()
+
+
+def _time_to_pylist(column) -> list:
+    """Cast to microseconds in C++ so to_pylist() yields datetime.time."""
+    return pc.cast(column, pa.time64("us"), safe=False).to_pylist()
+
+
+def _temporal_to_text(column) -> list:
+    """Render dates, times and timestamps as ISO text in C++ for pymssql.
+
+    pymssql's bulk copy rejects datetime.date and sends datetime.datetime as
+    DATETIME, truncating to milliseconds; SQL Server converts the text on
+    load without loss. tz-aware timestamps are rendered in UTC.
+    """
+    if pa.types.is_timestamp(column.type):
+        column = pc.cast(column, pa.timestamp("us"), safe=False)
+    elif pa.types.is_time(column.type):
+        column = pc.cast(column, pa.time64("us"), safe=False)
+    return pc.cast(column, pa.string()).to_pylist()
+
+
+def _is_temporal(arrow_type) -> bool:
+    """Whether the Arrow type is a date, time-of-day or timestamp type."""
+    return pa.types.is_date(arrow_type) or pa.types.is_time(arrow_type) or pa.types.is_timestamp(arrow_type)
+
+
+def _nested_to_pylist(column) -> list:
+    """Serialize list/struct/map values as JSON text for NVARCHAR(MAX) columns."""
+    return [None if value is None else json.dumps(value, default=str) for value in column.to_pylist()]
+
+
+# Per-type column converters, checked in order; other types (decimals with
+# scale > 6, strings, binary, numbers, dates) bind directly from to_pylist()
+COLUMN_CONVERTERS = (
+    (_decimal_as_text, _cast_to_text),
+    # uint64 exceeds the drivers' 64-bit signed ints; DECIMAL(20, 0) converts the text on bind
+    (pa.types.is_uint64, _cast_to_text),
+    (pa.types.is_timestamp, _timestamp_to_pylist),
+    (pa.types.is_time64, _time_to_pylist),
+    (pa.types.is_nested, _nested_to_pylist),
+)
+
+# pymssql (bulk_copy and INSERT paths) gets dates, times and timestamps as text
+PYMSSQL_COLUMN_CONVERTERS = ((_is_temporal, _temporal_to_text),) + COLUMN_CONVERTERS
+
+
+def _column_converters(arrow_schema, converter_table: tuple = COLUMN_CONVERTERS) -> list:
+    """Resolve the column converter for each field of the schema once."""
+    converters = []
+    for field in arrow_schema:
+        converter = next(
+            (convert for matches, convert in converter_table if matches(field.type)),
+            lambda column: column.to_pylist(),
+        )
+        converters.append(converter)
+    return converters
+
+
+def _batch_to_rows(record_batch, converters: list) -> list:
+    """Convert an Arrow RecordBatch into a list of row tuples, column by column."""
+    columns = [convert(column) for convert, column in zip(converters, record_batch.columns)]
+    # list(zip(...)) builds the tuples in C and sizes the list from the known
+    # length; a pre-sized [None] * n list filled in Python is ~10x slower
+    return list(zip(*columns))
+
+
+def _iter_record_batches(source, batch_size: int):
+    """Yield RecordBatches of at most batch_size rows from a Table or RecordBatchReader."""
+    if isinstance(source, pa.Table):
+        # Tables can carry zero-length chunks; skip them before any conversion work
+        yield from (b for b in source.to_batches(max_chunksize=batch_size) if b.num_rows > 0)
+        return
+    # Reader batches follow the Parquet row-group layout; slicing is zero-copy,
+    # and an empty batch yields no slices
+    for record_batch in source:
+        for offset in range(0, record_batch.num_rows, batch_size):
+            yield record_batch.slice(offset, batch_size)
+
+
+def _table_columns(conn, full_name: str) -> list:
+    """Return the column names of an existing table in column order."""
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT name FROM sys.columns WHERE object_id = OBJECT_ID({_placeholder(conn)}) ORDER BY column_id",
+        (full_name,),
+    )
+    return [name for (name,) in cursor.fetchall()]
+
+
+def _bulk_copy_column_ids(table_columns: list, column_names: list):
+    """Map each source column to its ordinal in table_columns for bulk_copy.
+
+    BCP binds by column position, so this keeps rows lined up with an existing
+    table whose column order differs. Returns None if a column is missing.
+    """
+    ordinals = {}
+    for ordinal, name in enumerate(table_columns, start=1):
+        ordinals.setdefault(name, ordinal)
+        ordinals.setdefault(name.lower(), ordinal)  # default collations are case-insensitive
+    column_ids = [ordinals.get(name, ordinals.get(name.lower())) for name in column_names]
+    return None if None in column_ids else column_ids
+
+
+class _SourceReadError(Exception):
+    """Carries an error reading the source out of bulk_copy, so it never triggers a fallback."""
+
+
+def _bulk_copy_rows(record_batches, converters: list, sent: list):
+    """Yield row tuples for one bulk_copy call, appending each record batch read to sent."""
+    while True:
+        try:
+            record_batch = next(record_batches)
+        except StopIteration:
+            return
+        except Exception as exc:
+            raise _SourceReadError() from exc
+        sent.append(record_batch)
+        yield from _batch_to_rows(record_batch, converters)
+
+
+def _prefetch(iterable, maxsize: int):
+    """Yield from iterable while a background thread reads up to maxsize items ahead.
+
+    Lets Iceberg/Parquet reads (Arrow C++ code, GIL released) overlap with
+    SQL Server writes. Producer errors are re-raised in the consumer.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # Time out regularly so an abandoned consumer never blocks the producer
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(("item", item)):
+                    return
+        except BaseException as exc:
+            put(("error", exc))
+        else:
+            put(("done", None))
+
+    threading.Thread(target=produce, name="iceberg-prefetch", daemon=True).start()
+    try:
+        while True:
+            kind, value = buffer.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        stop.set()
+
+
+def _prepare_insert(cursor, insert_prefix: str, param_types: list, row_count: int) -> int:
+    """Prepare a row_count-row INSERT with sp_prepare and return its handle."""
+    cols = len(param_types)
+    param_defs = ", ".join(f"@P{i + 1} {param_types[i % cols]}" for i in range(cols * row_count))
+    values_clause = ", ".join(
+        "(" + ", ".join(f"@P{row * cols + col + 1}" for col in range(cols)) + ")" for row in range(row_count)
+    )
+    cursor.execute(
+        "DECLARE @h INT; EXEC sp_prepare @h OUTPUT, %s, %s; SELECT @h",
+        (param_defs, f"{insert_prefix} VALUES {values_clause}"),
+    )
+    return cursor.fetchone()[0]
+
+
+def _multi_row_insert(cursor, insert_prefix: str, rows: list, param_types: list, handles: dict,
+                      max_params: int = 2000):
+    """Insert rows with prepared multi-row INSERT ... VALUES statements (pymssql).
+
+    Each statement carries as many rows as fit in max_params parameters (SQL
+    Server allows 2100) and the 1000-row VALUES limit, so a batch costs a few
+    round trips instead of one per row. param_types gives the SQL type of
+    each column; each statement shape is prepared once via sp_prepare and run
+    with sp_execute, and handles caches the handles by row count so the
+    server does not re-compile the INSERT per batch.
+    """
+    rows_per_stmt = max(1, min(MAX_VALUES_ROWS, max_params // len(param_types)))
+    for start in range(0, len(rows), rows_per_stmt):
+        chunk = rows[start : start + rows_per_stmt]
+        params = tuple(value for row in chunk for value in row)
+        if len(chunk) not in handles:
+            handles[len(chunk)] = _prepare_insert(cursor, insert_prefix, param_types, len(chunk))
+        cursor.execute(f"EXEC sp_execute {handles[len(chunk)]}, " + ", ".join(["%s"] * len(params)), params)
+
+
+def ingest_data(conn, schema_name: str, table_name: str, source, batch_size: int = 1000,
+                commit_interval: int = 50, column_sizes: dict = None, prefetch_batches: int = 4,
+                tablock: bool = False, concurrent: bool = False) -> int:
+    """Insert data from a PyArrow Table or RecordBatchReader into SQL Server in batches.
+
+    The transaction is committed every commit_interval batches and once at
+    the end; on failure the uncommitted batches are rolled back.
+    column_sizes (from string_column_sizes) sizes the pyodbc string binds.
+    A reader is drained by a background thread up to prefetch_batches ahead
+    (0 disables it). tablock takes a table lock so loads into a heap or an
+    empty table can be minimally logged. With concurrent (other sessions
+    load the same table), INSERT statements skip TABLOCK: unlike bulk
+    copy's BU lock, it is exclusive and would serialize the loads.
+    Returns the number of rows inserted.
+    """
     cursor = conn.cursor()
-    full_name = f"[{schema_name}].[{table_name}]"
-    col_names = [f"[{col}]" for col in arrow_table.column_names]
-    placeholders = ", ".join(["%s"] * len(col_names))
-    insert_sql = f"INSERT INTO {full_name} ({', '.join(col_names)}) VALUES ({placeholders})"
+    full_name = qualified_name(schema_name, table_name)
+    col_names = [quote_identifier(col) for col in source.schema.names]
+    marker = _placeholder(conn)
+    table_hint = " WITH (TABLOCK)" if tablock and not concurrent else ""
+    insert_prefix = f"INSERT INTO {full_name}{table_hint} ({', '.join(col_names)})"
+    insert_sql = f"{insert_prefix} VALUES ({', '.join([marker] * len(col_names))})"
+
+    # A streaming reader does not know its row count up front
+    total_rows = source.num_rows if isinstance(source, pa.Table) else None
+    if total_rows is None:
+        logger.info("Streaming rows into %s (batch_size=%d)...", full_name, batch_size)
+    else:
+        logger.info("Ingesting %d rows into %s (batch_size=%d)...", total_rows, full_name, batch_size)
 
-    total_rows = arrow_table.num_rows
-    logger.info("Ingesting %d rows into %s (batch_size=%d)...", total_rows, full_name, batch_size)
+    # Skip the per-statement row-count messages
+    cursor.execute("SET NOCOUNT ON")
 
-    # Convert to Python rows via pandas for reliable type conversion
-    df = arrow_table.to_pandas()
-    rows = df.values.tolist()
+    # pyodbc: ship each batch as an ODBC parameter array with stable bind sizes
+    fast_executemany = hasattr(cursor, "fast_executemany")
+    if fast_executemany:
+        cursor.fast_executemany = True
+        cursor.setinputsizes(_pyodbc_input_sizes(source.schema, column_sizes))
+        param_types = None
+    else:
+        # pymssql: prepare the fallback INSERT once per statement shape (sp_prepare)
+        column_sizes = column_sizes or {}
+        param_types = [arrow_type_to_sql(field.type, column_sizes.get(field.name)) for field in source.schema]
+    handles = {}
+    converters = _column_converters(
+        source.schema, COLUMN_CONVERTERS if fast_executemany else PYMSSQL_COLUMN_CONVERTERS
+    )
 
     inserted = 0
     start_time = time.time()
 
-    for i in range(0, len(rows), batch_size):
-        batch = rows[i : i + batch_size]
-        cursor.executemany(insert_sql, batch)
-        conn.commit()
-        inserted += len(batch)
+    def log_progress():
         elapsed = time.time() - start_time
         rate = inserted / elapsed if elapsed > 0 else 0
-        logger.info(
-            "  Progress: %d / %d rows (%.1f%%) — %.0f rows/sec",
-            inserted,
-            total_rows,
-            (inserted / total_rows) * 100,
-            rate,
-        )
+        if total_rows is None:
+            logger.info("  Progress: %d rows — %.0f rows/sec", inserted, rate)
+        else:
+            logger.info(
+                "  Progress: %d / %d rows (%.1f%%) — %.0f rows/sec",
+                inserted,
+                total_rows,
+                (inserted / total_rows) * 100,
+                rate,
+            )
+
+    # Prefer the TDS bulk-copy (BCP) protocol; fall back to parameter arrays
+    # (pyodbc) or multi-row VALUES statements if the driver lacks it or the
+    # server rejects the bulk load.
+    use_bulk_copy = hasattr(conn, "bulk_copy")
+    column_ids = None
+    if use_bulk_copy:
+        column_ids = _bulk_copy_column_ids(_table_columns(conn, full_name), source.schema.names)
+        if column_ids is None:
+            logger.warning("Not every column was found in %s; skipping bulk_copy.", full_name)
+            use_bulk_copy = False
+
+    record_batches = _iter_record_batches(source, batch_size)
+    if prefetch_batches > 0 and not isinstance(source, pa.Table):
+        record_batches = _prefetch(record_batches, prefetch_batches)
+    # The bulk_copy fallback rebinds record_batches; keep the source to close it
+    batch_source = record_batches
+
+    try:
+        # One bulk_copy call per commit interval: each call costs a metadata
+        # query and an INSERT BULK, and batch_size drives bcp_batch within it
+        while use_bulk_copy:
+            first_batch = next(record_batches, None)
+            if first_batch is None:
+                break
+            sent = [first_batch]
+            interval_batches = itertools.islice(record_batches, commit_interval - 1)
+            try:
+                rows = itertools.chain(
+                    _batch_to_rows(first_batch, converters), _bulk_copy_rows(interval_batches, converters, sent)
+                )
+                conn.bulk_copy(
+                    full_name, rows, column_ids=column_ids, batch_size=batch_size, tablock=tablock
+                )
+            except _SourceReadError as exc:
+                raise exc.__cause__ from None
+            except BULK_COPY_ERRORS as exc:
+                # Only switch paths while nothing has been committed yet
+                if inserted:
+                    raise
+                conn.rollback()
+                logger.warning("bulk_copy failed (%s); falling back to multi-row INSERT.", exc)
+                use_bulk_copy = False
+                # Replay the batches the failed call already read
+                record_batches = itertools.chain(sent, record_batches)
+                break
+            inserted += sum(record_batch.num_rows for record_batch in sent)
+            conn.commit()
+            log_progress()
+
+        uncommitted = 0
+        for record_batch in record_batches:
+            batch = _batch_to_rows(record_batch, converters)
+            if fast_executemany:
+                cursor.executemany(insert_sql, batch)
+            else:
+                _multi_row_insert(cursor, insert_prefix, batch, param_types, handles)
+            inserted += len(batch)
+
+            # Commit every commit_interval batches to amortize log flushes and round trips
+            uncommitted += 1
+            if uncommitted >= commit_interval:
+                conn.commit()
+                uncommitted = 0
+            log_progress()
+        for handle in handles.values():
+            cursor.execute(f"EXEC sp_unprepare {handle}")
+        conn.commit()
+    except BaseException:
+        logger.error("Ingestion into %s failed; rolling back uncommitted batches.", full_name)
+        # Report the ingest error, not a rollback failure on a broken connection
+        try:
+            conn.rollback()
+        except Exception:
+            logger.exception("Rollback of %s failed.", full_name)
+        raise
+    finally:
+        # Stop the prefetch thread now, not when the traceback is garbage-collected
+        batch_source.close()
 
     elapsed = time.time() - start_time
     logger.info("Ingestion complete: %d rows in %.2f seconds.", inserted, elapsed)
+    return inserted
 
 
-def run(config: dict):
-    """Main pipeline: read from Iceberg, write to SQL Server."""
-    iceberg_table = get_iceberg_table(config)
+def _set_autocommit(conn, enabled: bool):
+    """Toggle autocommit on a pymssql or pyodbc connection."""
+    if pyodbc is not None and isinstance(conn, pyodbc.Connection):
+        conn.autocommit = enabled
+    else:
+        conn.autocommit(enabled)
+
+
+@contextlib.contextmanager
+def bulk_logged_recovery(conn, enabled: bool = True):
+    """Switch a FULL-recovery database to BULK_LOGGED for the duration of the block.
+
+    The original recovery model is restored afterwards, even on failure.
+    ALTER DATABASE cannot run inside a transaction, so it is issued with
+    autocommit on. Requires ALTER permission on the database.
+    """
+    if not enabled:
+        yield
+        return
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT recovery_model_desc FROM sys.databases WHERE name = DB_NAME()")
+    # Drain the result set: without MARS, an open one blocks pyodbc's other statements
+    recovery_model = cursor.fetchall()[0][0]
+    if recovery_model != "FULL":
+        # SIMPLE and BULK_LOGGED already allow minimally logged inserts
+        yield
+        return
+
+    def set_recovery(model: str):
+        conn.commit()
+        _set_autocommit(conn, True)
+        try:
+            cursor.execute(f"ALTER DATABASE CURRENT SET RECOVERY {model}")
+        finally:
+            _set_autocommit(conn, False)
+
+    def restore():
+        logger.info("Restoring database recovery model to FULL.")
+        set_recovery("FULL")
+
+    logger.info("Switching database recovery model from FULL to BULK_LOGGED.")
+    set_recovery("BULK_LOGGED")
+    try:
+        yield
+    except BaseException:
+        # Report the load's own error, not a restore failure on a broken connection
+        try:
+            restore()
+        except Exception:
+            logger.exception(
+                "Could not restore FULL recovery; the database is still BULK_LOGGED. "
+                "Run ALTER DATABASE ... SET RECOVERY FULL and take a log backup."
+            )
+        raise
+    restore()
+
+
+def _csv_column_type(arrow_type):
+    """Return the Arrow type a column is cast to before staging it for BULK INSERT."""
+    if pa.types.is_boolean(arrow_type):
+        return pa.int8()  # BIT loads from 0/1, not true/false
+    if pa.types.is_timestamp(arrow_type):
+        return pa.timestamp("us")  # DATETIME2 takes at most 7 fractional digits and no 'Z'
+    if pa.types.is_time(arrow_type):
+        return pa.time64("us")
+    return arrow_type
+
+
+def _csv_compatible(arrow_schema) -> bool:
+    """Whether every column can round-trip through a delimited text file."""
+    return not any(
+        (pa.types.is_decimal(field.type) and not _decimal_as_text(field.type))
+        or pa.types.is_binary(field.type)
+        or pa.types.is_large_binary(field.type)
+        or pa.types.is_fixed_size_binary(field.type)
+        or pa.types.is_nested(field.type)
+        for field in arrow_schema
+    )
+
+
+def bulk_insert_data(conn, schema_name: str, table_name: str, source, staging_dir: str,
+                     server_dir: str = None, batch_size: int = 100_000, tablock: bool = True) -> int:
+    """Stage rows in a '|'-delimited file and load them with a single BULK INSERT.
+
+    staging_dir must be writable from this host and readable by SQL Server as
+    server_dir (defaults to staging_dir), e.g. a share both can reach.
+    Returns the number of rows loaded.
+    """
+    full_name = qualified_name(schema_name, table_name)
+    csv_schema = pa.schema([pa.field(field.name, _csv_column_type(field.type)) for field in source.schema])
+
+    # Table names may contain path separators or other characters unsafe in file names
+    file_prefix = re.sub(r"[^\w.-]", "_", table_name)
+    fd, local_path = tempfile.mkstemp(prefix=f"{file_prefix}_", suffix=".csv", dir=staging_dir)
+    os.close(fd)
+    server_dir = server_dir or staging_dir
+    separator = "\\" if "\\" in server_dir else "/"
+    server_path = server_dir.rstrip("/\\") + separator + os.path.basename(local_path)
+
+    start_time = time.time()
+    rows = 0
+    try:
+        write_options = pa_csv.WriteOptions(include_header=False, delimiter="|")
+        with pa_csv.CSVWriter(local_path, csv_schema, write_options=write_options) as writer:
+            for record_batch in _iter_record_batches(source, batch_size):
+                columns = [
+                    pc.cast(column, field.type, safe=False)
+                    for column, field in zip(record_batch.columns, csv_schema)
+                ]
+                writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=csv_schema))
+                rows += record_batch.num_rows
+        logger.info("Staged %d rows in %s; loading with BULK INSERT.", rows, local_path)
+
+        quoted_path = server_path.replace("'", "''")
+        table_lock = "TABLOCK, " if tablock else ""
+        cursor = conn.cursor()
+        cursor.execute(
+            f"BULK INSERT {full_name} FROM '{quoted_path}' "
+            f"WITH (FORMAT = 'CSV', FIELDTERMINATOR = '|', ROWTERMINATOR = '0x0a', "
+            f"CODEPAGE = '65001', {table_lock}BATCHSIZE = {batch_size})"
+        )
+        conn.commit()
+    finally:
+        try:
+            os.remove(local_path)
+        except OSError as exc:
+            # The load may already be committed; a leftover file must not make run() reload it
+            logger.warning("Could not delete staging file %s: %s", local_path, exc)
+
+    elapsed = time.time() - start_time
+    logger.info("BULK INSERT complete: %d rows in %.2f seconds.", rows, elapsed)
+    return rows
+
+
+def _use_bulk_insert(sql_cfg: dict, scan, source, conn, full_name: str) -> bool:
+    """Whether the load is configured for, and large enough to warrant, BULK INSERT."""
+    if not sql_cfg.get("bulk_insert_dir"):
+        return False
+    if not _csv_compatible(source.schema):
+        logger.info("Binary, nested or high-scale decimal columns cannot be staged as text; skipping BULK INSERT.")
+        return False
+    if isinstance(source, pa.Table):
+        rows = source.num_rows
+    else:
+        # Data file record counts are an upper bound: deletes and filters are not applied
+        rows = sum(task.file.record_count for task in scan.plan_files())
+        if scan.limit is not None:
+            rows = min(rows, scan.limit)
+    if rows <= sql_cfg.get("bulk_threshold", 1_000_000):
+        return False
+    # BULK INSERT maps file fields to table columns by position
+    table_columns = _table_columns(conn, full_name)
+    if _bulk_copy_column_ids(table_columns, source.schema.names) != list(range(1, len(table_columns) + 1)):
+        logger.info("%s's columns differ from the source's; skipping BULK INSERT.", full_name)
+        return False
+    return True
+
+
+def _commit_interval(sql_cfg: dict) -> int:
+    """Return the configured number of batches per commit."""
+    interval = sql_cfg.get("commit_interval", 50)
+    if not isinstance(interval, int) or interval < 1:
+        logger.error("commit_interval must be a positive integer, got %r.", interval)
+        sys.exit(1)
+    return interval
 
-    # Apply optional row filter or column selection
-    iceberg_cfg = config["iceberg"]
-    selected_columns = iceberg_cfg.get("columns")
-    row_filter = iceberg_cfg.get("row_filter")
 
-    scan = iceberg_table.scan()
-    if selected_columns:
-        scan = scan.select(*selected_columns)
-        logger.info("Selecting columns: %s", selected_columns)
-    if row_filter:
-        scan = scan.filter(row_filter)
-        logger.info("Applying row filter: %s", row_filter)
+def _ingest_options(sql_cfg: dict) -> dict:
+    """Collect ingest_data() keyword arguments from the sql_server config."""
+    return {
+        "batch_size": sql_cfg.get("batch_size", 1000),
+        "commit_interval": _commit_interval(sql_cfg),
+        "prefetch_batches": sql_cfg.get("prefetch_batches", 4),
+        "tablock": sql_cfg.get("tablock", sql_cfg.get("drop_existing", False)),
+    }
 
-    arrow_table = scan.to_arrow()
-    logger.info("Read %d rows, %d columns from Iceberg.", arrow_table.num_rows, arrow_table.num_columns)
 
-    if arrow_table.num_rows == 0:
+def build_scan(iceberg_table, iceberg_cfg: dict, snapshot_id: int = None):
+    """Build the Iceberg scan, pushing projection, row filter and limit into planning.
+
+    snapshot_id pins the scan to a snapshot; by default it reads the current one.
+    """
+    row_filter = iceberg_cfg.get("row_filter") or AlwaysTrue()
+    if isinstance(row_filter, str):
+        # Parse up front so the expression prunes manifests, files and row groups
+        row_filter = parse_row_filter(row_filter)
+    return iceberg_table.scan(
+        row_filter=row_filter,
+        selected_fields=tuple(iceberg_cfg.get("columns") or ("*",)),
+        case_sensitive=iceberg_cfg.get("case_sensitive", True),
+        limit=iceberg_cfg.get("limit"),
+        snapshot_id=snapshot_id,
+    )
+
+
+def _sql_target(config: dict) -> tuple:
+    """Return the (schema, table) to write into SQL Server."""
+    sql_cfg = config["sql_server"]
+    return sql_cfg.get("target_schema", "dbo"), sql_cfg.get("target_table", config["iceberg"]["table"])
+
+
+# Per-process state for parallel ingestion workers, populated by _init_worker
+_worker_state = {}
+
+
+def _init_worker(config: dict, snapshot_id: int, rows_counter, log_level: int):
+    """Load the Iceberg scan in a worker process and plan its data files once.
+
+    The scan reads the parent's snapshot, so commits made since the parent
+    planned its files never change what a worker reads.
+    """
+    logging.getLogger().setLevel(log_level)
+    scan = build_scan(get_iceberg_table(config), config["iceberg"], snapshot_id)
+    _worker_state.update(
+        config=config,
+        scan=scan,
+        rows=rows_counter,
+        tasks={task.file.file_path: task for task in scan.plan_files()},
+    )
+
+
+def _ingest_file(file_path: str) -> int:
+    """Worker entry point: stream one Iceberg data file into SQL Server."""
+    config = _worker_state["config"]
+    scan = _worker_state["scan"]
+    task = _worker_state["tasks"].get(file_path)
+    if task is None:
+        raise RuntimeError(f"Data file {file_path} is not in the worker's plan of snapshot {scan.snapshot_id}.")
+    projected_schema = scan.projection()
+    batches = iter(ArrowScan(
+        scan.table_metadata, scan.io, projected_schema, scan.row_filter, scan.case_sensitive, scan.limit
+    ).to_record_batches([task]))
+
+    # ArrowScan batches need not match schema_to_pyarrow() (e.g. string vs
+    # large_string), so describe the reader by the data actually read
+    first_batch = next((b for b in batches if b.num_rows > 0), None)
+    if first_batch is None:
+        return 0
+    reader = pa.RecordBatchReader.from_batches(first_batch.schema, itertools.chain([first_batch], batches))
+
+    target_schema, target_table = _sql_target(config)
+    conn = connect_sql_server(config)
+    try:
+        inserted = ingest_data(
+            conn, target_schema, target_table, reader, concurrent=True, **_ingest_options(config["sql_server"])
+        )
+    finally:
+        conn.close()
+
+    rows = _worker_state["rows"]
+    with rows.get_lock():
+        rows.value += inserted
+    return inserted
+
+
+def run_parallel(config: dict, scan, workers: int):
+    """Fan the scan's data files out to a pool of worker processes."""
+    tasks = list(scan.plan_files())
+    if not tasks:
         logger.warning("No data returned from Iceberg table. Nothing to ingest.")
         return
+    if config["sql_server"].get("size_string_columns", False):
+        logger.warning("size_string_columns needs the full scan in one process; using (MAX) columns.")
+    if config["sql_server"].get("bulk_insert_dir"):
+        logger.warning("BULK INSERT needs the full scan in one process; workers use bulk copy instead.")
+    logger.info("Ingesting %d data files with %d worker processes.", len(tasks), workers)
+
+    # Create (or recreate) the target table once, before any worker writes to it
+    sql_cfg = config["sql_server"]
+    target_schema, target_table = _sql_target(config)
+    # Pin the workers to the snapshot planned here; each still re-plans it once
+    snapshot_id = scan.snapshot().snapshot_id
+    rows = multiprocessing.Value("q", 0)
+    start_time = time.time()
+    conn = connect_sql_server(config)
+    try:
+        create_table_if_needed(
+            conn,
+            target_schema,
+            target_table,
+            schema_to_pyarrow(scan.projection()),
+            sql_cfg.get("drop_existing", False),
+        )
+        with bulk_logged_recovery(conn, sql_cfg.get("bulk_logged", False)):
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(tasks)),
+                initializer=_init_worker,
+                initargs=(config, snapshot_id, rows, logging.getLogger().level),
+            ) as pool:
+                futures = [pool.submit(_ingest_file, task.file.file_path) for task in tasks]
+                try:
+                    for done, future in enumerate(as_completed(futures), start=1):
+                        future.result()
+                        logger.info("  Files: %d / %d done — %d rows ingested", done, len(tasks), rows.value)
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+    finally:
+        conn.close()
+
+    elapsed = time.time() - start_time
+    logger.info("Parallel ingestion complete: %d rows in %.2f seconds.", rows.value, elapsed)
+
+
+def run(config: dict):
+    """Main pipeline: read from Iceberg, write to SQL Server."""
+    iceberg_table = get_iceberg_table(config)
+
+    # Apply optional row filter or column selection
+    iceberg_cfg = config["iceberg"]
+    scan = build_scan(iceberg_table, iceberg_cfg)
+    if iceberg_cfg.get("columns"):
+        logger.info("Selecting columns: %s", iceberg_cfg["columns"])
+    if iceberg_cfg.get("row_filter"):
+        logger.info("Applying row filter: %s", iceberg_cfg["row_filter"])
+    if iceberg_cfg.get("limit"):
+        logger.info("Limiting scan to %d rows.", iceberg_cfg["limit"])
+    if logger.isEnabledFor(logging.DEBUG):
+        # Planning both scans reads the manifests twice, so only do it when debugging
+        all_files = sum(1 for _ in iceberg_table.scan().plan_files())
+        kept_files = sum(1 for _ in scan.plan_files())
+        logger.debug("File pruning: scanning %d of %d data files.", kept_files, all_files)
 
     # SQL Server target settings
     sql_cfg = config["sql_server"]
-    target_schema = sql_cfg.get("target_schema", "dbo")
-    target_table = sql_cfg.get("target_table", iceberg_cfg["table"])
+    target_schema, target_table = _sql_target(config)
     drop_existing = sql_cfg.get("drop_existing", False)
-    batch_size = sql_cfg.get("batch_size", 1000)
+    workers = sql_cfg.get("workers", 1)
+
+    if workers > 1 and iceberg_cfg.get("limit"):
+        # Each worker would apply the limit to its own file
+        logger.warning("iceberg.limit is set; ingesting with a single process.")
+    elif workers > 1:
+        run_parallel(config, scan, workers)
+        return
+
+    column_sizes = None
+    if sql_cfg.get("size_string_columns", False):
+        # Sizing needs every value, so buffer the whole scan instead of streaming it
+        source = scan.to_arrow()
+        logger.info("Read %d rows, %d columns from Iceberg.", source.num_rows, source.num_columns)
+        if source.num_rows == 0:
+            logger.warning("No data returned from Iceberg table. Nothing to ingest.")
+            return
+        column_sizes = string_column_sizes(source)
+        logger.info("Measured string/binary column sizes: %s", column_sizes)
+    else:
+        # Stream record batches so memory stays O(batch) and reads overlap writes
+        reader = scan.to_arrow_batch_reader()
+
+        # Peek at the first non-empty batch so an empty scan never touches SQL Server
+        batches = iter(reader)
+        first_batch = next((b for b in batches if b.num_rows > 0), None)
+        if first_batch is None:
+            logger.warning("No data returned from Iceberg table. Nothing to ingest.")
+            return
+        source = pa.RecordBatchReader.from_batches(reader.schema, itertools.chain([first_batch], batches))
+        logger.info("Streaming %d columns from Iceberg.", len(source.schema))
 
     conn = connect_sql_server(config)
     try:
-        create_table_if_needed(conn, target_schema, target_table, arrow_table.schema, drop_existing)
-        ingest_data(conn, target_schema, target_table, arrow_table, batch_size)
+        create_table_if_needed(conn, target_schema, target_table, source.schema, drop_existing, column_sizes)
+        with bulk_logged_recovery(conn, sql_cfg.get("bulk_logged", False)):
+            if _use_bulk_insert(sql_cfg, scan, source, conn, qualified_name(target_schema, target_table)):
+                try:
+                    bulk_insert_data(
+                        conn, target_schema, target_table, source,
+                        sql_cfg["bulk_insert_dir"], sql_cfg.get("bulk_insert_server_dir"),
+                        tablock=_ingest_options(sql_cfg)["tablock"],
+                    )
+                    return
+                except BULK_INSERT_ERRORS as exc:
+                    conn.rollback()
+                    logger.warning("BULK INSERT failed (%s); falling back to client-side bulk copy.", exc)
+                    if not isinstance(source, pa.Table):
+                        source = scan.to_arrow_batch_reader()
+            ingest_data(
+                conn, target_schema, target_table, source, column_sizes=column_sizes, **_ingest_options(sql_cfg)
+            )
     finally:
         conn.close()
         logger.info("SQL Server connection closed.")
@@ -259,7 +1126,7 @@ def main():
     parser.add_argument(
         "-c", "--config",
         default="config.yaml",
-        help="Path to YAML config file (default: config.yaml)",
+        help="Path to YAML or JSON config file (default: config.yaml)",
     )
     parser.add_argument(
         "--iceberg-catalog-name",
@@ -294,6 +1161,11 @@ def main():
         "--sql-password",
         help="Override SQL Server password",
     )
+    parser.add_argument(
+        "--sql-driver",
+        choices=["pymssql", "pyodbc"],
+        help="Override SQL Server driver",
+    )
     parser.add_argument(
         "--sql-target-schema",
         help="Override SQL Server target schema",
@@ -307,6 +1179,11 @@ def main():
         type=int,
         help="Override batch size for inserts",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Override number of parallel ingestion worker processes",
+    )
     parser.add_argument(
         "--drop-existing",
         action="store_true",
@@ -341,12 +1218,16 @@ def main():
         config.setdefault("sql_server", {})["user"] = args.sql_user
     if args.sql_password:
         config.setdefault("sql_server", {})["password"] = args.sql_password
+    if args.sql_driver:
+        config.setdefault("sql_server", {})["driver"] = args.sql_driver
     if args.sql_target_schema:
         config.setdefault("sql_server", {})["target_schema"] = args.sql_target_schema
     if args.sql_target_table:
         config.setdefault("sql_server", {})["target_table"] = args.sql_target_table
     if args.batch_size:
         config.setdefault("sql_server", {})["batch_size"] = args.batch_size
+    if args.workers:
+        config.setdefault("sql_server", {})["workers"] = args.workers
     if args.drop_existing:
         config.setdefault("sql_server", {})["drop_existing"] = True
 
@@ -0,0 +1,660 @@
+import concurrent.futures
+import contextlib
+import datetime
+import decimal
+import itertools
+import json
+import logging
+import multiprocessing
+import sys
+import threading
+import time
+import types
+
+import pyarrow as pa
+import pytest
+from pyiceberg.expressions import AlwaysTrue, BooleanExpression, GreaterThan
+
+import iceberg_to_sqlserver as ingest
+
+
+class StubCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.last_sql = None
+
+    def execute(self, sql, params=None):
+        self.last_sql = sql
+        self.conn.statements.append((sql, params))
+
+    def fetchone(self):
+        if "sp_prepare" in self.last_sql:
+            return (1,)  # prepared statement handle
+        return (None,)  # OBJECT_ID(): the target table does not exist yet
+
+    def fetchall(self):
+        if "recovery_model_desc" in self.last_sql:
+            return [(self.conn.recovery_model,)]
+        return [(name,) for name in self.conn.table_columns]
+
+
+class StubConnection:
+    """Records what a pymssql connection would send to SQL Server."""
+
+    def __init__(self, table_columns=(), recovery_model="FULL"):
+        self.table_columns = list(table_columns)
+        self.recovery_model = recovery_model
+        self.statements = []
+        self.bulk_copies = []
+
+    def cursor(self):
+        return StubCursor(self)
+
+    def bulk_copy(self, table_name, elements, column_ids=None, **kwargs):
+        self.bulk_copies.append((table_name, list(elements), column_ids))
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def autocommit(self, enabled):
+        pass
+
+    def close(self):
+        pass
+
+
+class StubScan:
+    def __init__(self, arrow_table, limit=None):
+        self.arrow_table = arrow_table
+        self.limit = limit
+
+    def to_arrow_batch_reader(self):
+        return self.arrow_table.to_reader(max_chunksize=2)
+
+    def plan_files(self):
+        return []
+
+
+class StubIcebergTable:
+    def __init__(self, arrow_table):
+        self.arrow_table = arrow_table
+        self.scan_kwargs = None
+
+    def scan(self, **kwargs):
+        self.scan_kwargs = kwargs
+        return StubScan(self.arrow_table, kwargs.get("limit"))
+
+
+SAMPLE = pa.table({
+    "id": pa.array([1, 2, 3], pa.int64()),
+    "name": ["a", None, "c"],
+    "amount": pa.array([decimal.Decimal("1.25"), None, decimal.Decimal("-0.50")], pa.decimal128(10, 2)),
+    "day": pa.array([datetime.date(2024, 1, 2), None, datetime.date(2024, 3, 4)]),
+    "ts": pa.array([datetime.datetime(2024, 1, 2, 3, 4, 5, 6)] * 3, pa.timestamp("us", tz="UTC")),
+})
+
+
+def sql_config(**sql_server):
+    return {
+        "iceberg": {"namespace": "ns", "table": "sample"},
+        "sql_server": {"host": "localhost", "database": "db", "user": "sa", "password": "pw", **sql_server},
+    }
+
+
+class PandasImportRecorder:
+    """Meta path finder that records pandas imports, whether or not pandas is installed."""
+
+    def __init__(self):
+        self.attempts = []
+
+    def find_spec(self, name, path=None, target=None):
+        if name == "pandas" or name.startswith("pandas."):
+            self.attempts.append(name)
+        return None  # let the regular finders resolve (or fail) the import
+
+
+@pytest.fixture
+def pandas_imports(monkeypatch):
+    """Record every pandas import attempted during the test."""
+    # Forget an already-imported pandas so importing it again reaches the finder
+    for name in list(sys.modules):
+        if name == "pandas" or name.startswith("pandas."):
+            monkeypatch.delitem(sys.modules, name)
+    recorder = PandasImportRecorder()
+    monkeypatch.setattr(sys, "meta_path", [recorder] + sys.meta_path)
+    return recorder.attempts
+
+
+def test_load_config_reads_json_and_yaml(tmp_path):
+    config = sql_config(batch_size=500)
+    json_path = tmp_path / "config.json"
+    json_path.write_text(json.dumps(config))
+    yaml_path = tmp_path / "config.yaml"
+    yaml_path.write_text(
+        "iceberg:\n  namespace: ns\n  table: sample\n"
+        "sql_server:\n  host: localhost\n  database: db\n  user: sa\n  password: pw\n  batch_size: 500\n"
+    )
+
+    assert ingest.load_config(str(json_path)) == config
+    assert ingest.load_config(str(yaml_path)) == config
+
+
+@pytest.mark.parametrize("iceberg_cfg, expected", [
+    ({}, {"row_filter": AlwaysTrue(), "selected_fields": ("*",), "case_sensitive": True, "limit": None}),
+    ({"row_filter": "", "columns": []}, {"row_filter": AlwaysTrue(), "selected_fields": ("*",)}),
+    (
+        {"row_filter": "id > 1", "columns": ["id", "name"], "case_sensitive": False, "limit": 10},
+        {
+            "row_filter": GreaterThan("id", 1),
+            "selected_fields": ("id", "name"),
+            "case_sensitive": False,
+            "limit": 10,
+        },
+    ),
+])
+def test_build_scan_pushes_config_into_scan(iceberg_cfg, expected):
+    table = StubIcebergTable(SAMPLE)
+
+    ingest.build_scan(table, iceberg_cfg, snapshot_id=7)
+
+    assert isinstance(table.scan_kwargs["row_filter"], BooleanExpression)
+    assert {key: table.scan_kwargs[key] for key in expected} == expected
+    assert table.scan_kwargs["snapshot_id"] == 7
+
+
+def test_run_does_not_import_pandas(monkeypatch, pandas_imports):
+    conn = StubConnection(SAMPLE.schema.names)
+    monkeypatch.setattr(ingest, "get_iceberg_table", lambda config: StubIcebergTable(SAMPLE))
+    monkeypatch.setattr(ingest, "connect_sql_server", lambda config: conn)
+
+    ingest.run(sql_config())
+
+    assert pandas_imports == []
+    assert "pandas" not in sys.modules
+    assert sum(len(rows) for _, rows, _ in conn.bulk_copies) == SAMPLE.num_rows
+
+
+def test_odbc_connection_string_quotes_values():
+    sql_cfg = sql_config(password="p}w;", database="my db")["sql_server"]
+
+    assert ingest._odbc_connection_string(sql_cfg) == (
+        "DRIVER={ODBC Driver 18 for SQL Server};SERVER=localhost,1433;"
+        "DATABASE={my db};UID={sa};PWD={p}}w;};"
+    )
+
+
+@pytest.mark.parametrize("packet_size", [None, 512, 32767])
+def test_packet_size_accepts_tds_range(packet_size):
+    assert ingest._packet_size({"packet_size": packet_size}) == packet_size
+
+
+@pytest.mark.parametrize("packet_size", [511, 32768, "8192"])
+def test_packet_size_rejects_out_of_range(packet_size):
+    with pytest.raises(SystemExit):
+        ingest._packet_size({"packet_size": packet_size})
+
+
+CONVERTER_BATCH = pa.record_batch({
+    "tags": pa.array([[1, 2], None], pa.list_(pa.int32())),
+    "point": pa.array([{"x": 1, "y": "a"}, None]),
+    "attrs": pa.array([[("k", 1)], None], pa.map_(pa.string(), pa.int64())),
+    "at": pa.array([3_723_000_004_567, None], pa.time64("ns")),  # 01:02:03.000004567
+    "ts": pa.array([1_704_164_645_000_006_789, None], pa.timestamp("ns", tz="America/New_York")),
+})
+
+
+@pytest.mark.parametrize("converter_table, at, ts", [
+    (ingest.COLUMN_CONVERTERS, datetime.time(1, 2, 3, 4), datetime.datetime(2024, 1, 2, 3, 4, 5, 6)),
+    (ingest.PYMSSQL_COLUMN_CONVERTERS, "01:02:03.000004", "2024-01-02 03:04:05.000006"),
+])
+def test_batch_to_rows_converts_nested_and_temporal_columns(converter_table, at, ts):
+    converters = ingest._column_converters(CONVERTER_BATCH.schema, converter_table)
+
+    rows = ingest._batch_to_rows(CONVERTER_BATCH, converters)
+
+    # Nested values become JSON text; times and timestamps truncate to microseconds, in UTC
+    assert rows == [
+        ("[1, 2]", '{"x": 1, "y": "a"}', '[["k", 1]]', at, ts),
+        (None, None, None, None, None),
+    ]
+
+
+def test_bulk_copy_binds_columns_by_name():
+    # Existing table with an identity column and a different column order
+    conn = StubConnection(["row_id", "ts", "DAY", "amount", "name", "id"])
+
+    ingest.ingest_data(conn, "dbo", "sample", SAMPLE.to_reader(), prefetch_batches=0)
+
+    table_name, rows, column_ids = conn.bulk_copies[0]
+    assert table_name == "[dbo].[sample]"
+    assert column_ids == [6, 5, 4, 3, 2]
+    assert rows[0] == (1, "a", "1.25", "2024-01-02", "2024-01-02 03:04:05.000006")
+
+
+def test_bulk_copy_conversion_error_falls_back_to_insert(monkeypatch):
+    conn = StubConnection(SAMPLE.schema.names)
+
+    def reject(*args, **kwargs):
+        raise TypeError("value can only be a datetime.datetime")
+
+    monkeypatch.setattr(conn, "bulk_copy", reject)
+
+    assert ingest.ingest_data(conn, "dbo", "sample", SAMPLE, prefetch_batches=0) == SAMPLE.num_rows
+    assert any(sql.startswith("EXEC sp_execute") for sql, _ in conn.statements)
+
+
+@pytest.mark.parametrize("concurrent, table_hint", [(False, " WITH (TABLOCK)"), (True, "")])
+def test_tablock_hints_bulk_copy_and_insert(monkeypatch, concurrent, table_hint):
+    conn = StubConnection(SAMPLE.schema.names)
+    bulk_copy_options = []
+
+    def reject(table_name, elements, **kwargs):
+        bulk_copy_options.append(kwargs)
+        raise TypeError("value can only be a datetime.datetime")
+
+    monkeypatch.setattr(conn, "bulk_copy", reject)
+
+    ingest.ingest_data(conn, "dbo", "sample", SAMPLE, prefetch_batches=0, tablock=True, concurrent=concurrent)
+
+    # Bulk copy's BU lock lets concurrent loads share the table, so only INSERT drops the hint
+    assert bulk_copy_options[0]["tablock"] is True
+    prepared = [params[1] for sql, params in conn.statements if "sp_prepare" in sql]
+    assert prepared and all(
+        statement.startswith(f"INSERT INTO [dbo].[sample]{table_hint} ([id]") for statement in prepared
+    )
+
+
+@pytest.mark.parametrize("sql_cfg, tablock", [
+    ({}, False),
+    ({"drop_existing": True}, True),
+    ({"drop_existing": True, "tablock": False}, False),
+    ({"tablock": True}, True),
+])
+def test_tablock_defaults_to_drop_existing(sql_cfg, tablock):
+    assert ingest._ingest_options(sql_cfg)["tablock"] is tablock
+
+
+def test_bulk_copy_spans_commit_interval():
+    conn = StubConnection(SAMPLE.schema.names)
+    table = pa.concat_tables([SAMPLE] * 4).combine_chunks()
+
+    ingest.ingest_data(conn, "dbo", "sample", table, batch_size=2, commit_interval=3, prefetch_batches=0)
+
+    assert [len(rows) for _, rows, _ in conn.bulk_copies] == [6, 6]
+
+
+@pytest.mark.parametrize("commit_interval", [0, -1, 2.5])
+def test_commit_interval_must_be_positive(commit_interval):
+    with pytest.raises(SystemExit):
+        ingest._ingest_options({"commit_interval": commit_interval})
+
+
+def test_iter_record_batches_skips_empty_batches():
+    batch = SAMPLE.to_batches()[0]
+    empty = batch.slice(0, 0)
+    table = pa.Table.from_batches([batch, empty, batch])
+    reader = pa.RecordBatchReader.from_batches(SAMPLE.schema, [empty, batch, empty])
+
+    assert [b.num_rows for b in ingest._iter_record_batches(table, 2)] == [2, 1, 2, 1]
+    assert [b.num_rows for b in ingest._iter_record_batches(reader, 2)] == [2, 1]
+
+
+def test_empty_batches_do_not_count_toward_commit_interval():
+    batch = SAMPLE.to_batches()[0]
+    empty = batch.slice(0, 0)
+    reader = pa.RecordBatchReader.from_batches(SAMPLE.schema, [batch, empty, empty, batch, batch])
+    conn = StubConnection(SAMPLE.schema.names)
+
+    ingest.ingest_data(conn, "dbo", "sample", reader, commit_interval=2, prefetch_batches=0)
+
+    assert [len(rows) for _, rows, _ in conn.bulk_copies] == [6, 3]
+
+
+def test_bulk_copy_source_error_does_not_fall_back():
+    def batches():
+        yield SAMPLE.to_batches()[0]
+        raise pa.ArrowInvalid("corrupt row group")
+
+    conn = StubConnection(SAMPLE.schema.names)
+    reader = pa.RecordBatchReader.from_batches(SAMPLE.schema, batches())
+
+    with pytest.raises(pa.ArrowInvalid, match="corrupt row group"):
+        ingest.ingest_data(conn, "dbo", "sample", reader, prefetch_batches=0)
+    assert not any(sql.startswith("EXEC sp_execute") for sql, _ in conn.statements)
+
+
+@pytest.mark.parametrize("columns, rows, expected", [
+    (1, 2500, [1000, 1000, 500]),  # 1000-row VALUES limit
+    (3, 1400, [666, 666, 68]),  # 2000-parameter limit
+    (2500, 2, [1, 1]),  # rows wider than max_params still go one per statement
+])
+def test_multi_row_insert_chunks_at_statement_limits(columns, rows, expected):
+    conn = StubConnection()
+    row = tuple(range(columns))
+
+    ingest._multi_row_insert(conn.cursor(), "INSERT INTO [dbo].[t]", [row] * rows, ["INT"] * columns, {})
+
+    executes = [params for sql, params in conn.statements if sql.startswith("EXEC sp_execute")]
+    assert [len(params) // columns for params in executes] == expected
+
+
+def test_multi_row_insert_prepares_each_statement_shape_once():
+    conn = StubConnection()
+    handles = {}
+    rows = [(1, "a"), (2, "b"), (3, "c")]
+    insert_prefix = "INSERT INTO [dbo].[t] ([id], [name])"
+
+    for _ in range(2):
+        ingest._multi_row_insert(
+            conn.cursor(), insert_prefix, rows, ["BIGINT", "NVARCHAR(MAX)"], handles, max_params=4
+        )
+
+    prepares = [params for sql, params in conn.statements if "sp_prepare" in sql]
+    assert prepares == [
+        (
+            "@P1 BIGINT, @P2 NVARCHAR(MAX), @P3 BIGINT, @P4 NVARCHAR(MAX)",
+            f"{insert_prefix} VALUES (@P1, @P2), (@P3, @P4)",
+        ),
+        ("@P1 BIGINT, @P2 NVARCHAR(MAX)", f"{insert_prefix} VALUES (@P1, @P2)"),
+    ]
+    executes = [(sql, params) for sql, params in conn.statements if sql.startswith("EXEC sp_execute")]
+    assert executes[:2] == [
+        ("EXEC sp_execute 1, %s, %s, %s, %s", (1, "a", 2, "b")),
+        ("EXEC sp_execute 1, %s, %s", (3, "c")),
+    ]
+    assert len(executes) == 4
+    assert sorted(handles) == [1, 2]
+
+
+def test_prefetch_reraises_producer_error():
+    def produce():
+        yield 1
+        raise ValueError("unreadable data file")
+
+    items = ingest._prefetch(produce(), 2)
+
+    assert next(items) == 1
+    with pytest.raises(ValueError, match="unreadable data file"):
+        next(items)
+
+
+def test_prefetch_stops_when_consumer_abandons_it():
+    produced = []
+
+    def produce():
+        for item in itertools.count():
+            produced.append(item)
+            yield item
+
+    items = ingest._prefetch(produce(), 2)
+    assert next(items) == 0
+    items.close()
+
+    deadline = time.monotonic() + 5
+    while any(t.name == "iceberg-prefetch" and t.is_alive() for t in threading.enumerate()):
+        assert time.monotonic() < deadline, "producer thread kept running"
+        time.sleep(0.05)
+    assert len(produced) <= 4  # one consumed, two buffered, one blocked in put()
+
+
+def test_failed_ingest_stops_prefetch_thread(monkeypatch):
+    conn = StubConnection(SAMPLE.schema.names)
+    reader = pa.RecordBatchReader.from_batches(SAMPLE.schema, itertools.repeat(SAMPLE.to_batches()[0]))
+
+    def server_gone(*args, **kwargs):
+        raise RuntimeError("server gone")
+
+    monkeypatch.setattr(conn, "bulk_copy", server_gone)
+
+    # Holding the exception keeps its traceback, and so the generator, alive
+    with pytest.raises(RuntimeError) as excinfo:
+        ingest.ingest_data(conn, "dbo", "sample", reader, prefetch_batches=2)
+
+    deadline = time.monotonic() + 1
+    while any(t.name == "iceberg-prefetch" and t.is_alive() for t in threading.enumerate()):
+        assert time.monotonic() < deadline, "producer thread kept running"
+        time.sleep(0.05)
+    assert excinfo.value.args == ("server gone",)
+
+
+def test_failed_rollback_keeps_ingest_error(monkeypatch):
+    conn = StubConnection(SAMPLE.schema.names)
+
+    def interrupt(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    def drop_connection():
+        raise ingest.pymssql.OperationalError("connection lost")
+
+    monkeypatch.setattr(conn, "bulk_copy", interrupt)
+    monkeypatch.setattr(conn, "rollback", drop_connection)
+
+    with pytest.raises(KeyboardInterrupt):
+        ingest.ingest_data(conn, "dbo", "sample", SAMPLE, prefetch_batches=0)
+
+
+class LoadFailed(Exception):
+    pass
+
+
+def recovery_changes(conn):
+    return [sql.rsplit(" ", 1)[1] for sql, _ in conn.statements if sql.startswith("ALTER DATABASE")]
+
+
+@pytest.mark.parametrize("body_error", [None, LoadFailed])
+def test_bulk_logged_recovery_restores_full(body_error):
+    conn = StubConnection()
+
+    with pytest.raises(body_error) if body_error else contextlib.nullcontext():
+        with ingest.bulk_logged_recovery(conn):
+            assert recovery_changes(conn) == ["BULK_LOGGED"]
+            if body_error:
+                raise body_error
+
+    assert recovery_changes(conn) == ["BULK_LOGGED", "FULL"]
+
+
+def test_bulk_logged_recovery_leaves_other_models_alone():
+    conn = StubConnection(recovery_model="SIMPLE")
+
+    with ingest.bulk_logged_recovery(conn):
+        pass
+
+    assert recovery_changes(conn) == []
+
+
+def test_bulk_logged_recovery_restore_failure_keeps_load_error(monkeypatch):
+    conn = StubConnection()
+    execute = StubCursor.execute
+
+    def fail_restore(cursor, sql, params=None):
+        if sql.endswith("SET RECOVERY FULL"):
+            raise ingest.pymssql.OperationalError("connection lost")
+        execute(cursor, sql, params)
+
+    monkeypatch.setattr(StubCursor, "execute", fail_restore)
+
+    with pytest.raises(LoadFailed):
+        with ingest.bulk_logged_recovery(conn):
+            raise LoadFailed
+
+
+def test_staging_file_cleanup_failure_does_not_reload(tmp_path, monkeypatch):
+    conn = StubConnection(SAMPLE.schema.names)
+    monkeypatch.setattr(ingest, "get_iceberg_table", lambda config: StubIcebergTable(SAMPLE))
+    monkeypatch.setattr(ingest, "connect_sql_server", lambda config: conn)
+
+    def locked(path):
+        raise PermissionError(f"file in use: {path}")
+
+    monkeypatch.setattr(ingest.os, "remove", locked)
+
+    ingest.run(sql_config(bulk_insert_dir=str(tmp_path), bulk_threshold=-1))
+
+    assert sum(sql.startswith("BULK INSERT") for sql, _ in conn.statements) == 1
+    assert conn.bulk_copies == []
+
+
+@pytest.mark.parametrize("table_columns", [
+    ["name", "id", "amount", "day", "ts"],  # reordered
+    ["row_id", "id", "name", "amount", "day", "ts"],  # extra identity column
+])
+def test_bulk_insert_requires_matching_column_order(tmp_path, table_columns):
+    conn = StubConnection(table_columns)
+    sql_cfg = {"bulk_insert_dir": str(tmp_path), "bulk_threshold": 0}
+
+    assert not ingest._use_bulk_insert(sql_cfg, None, SAMPLE, conn, "[dbo].[sample]")
+    conn.table_columns = SAMPLE.schema.names
+    assert ingest._use_bulk_insert(sql_cfg, None, SAMPLE, conn, "[dbo].[sample]")
+
+
+@pytest.mark.parametrize("max_len, expected", [
+    (0, 1),
+    (3, 4),
+    (4000, 4000),
+    (4001, None),  # MAX
+    (None, None),  # all-null column
+])
+def test_round_column_size(max_len, expected):
+    assert ingest._round_column_size(max_len, ingest.MAX_NVARCHAR_LENGTH) == expected
+
+
+@pytest.mark.parametrize("column, expected", [
+    (pa.array(["abc", None]), 4),
+    (pa.array([None, None], pa.string()), None),  # all-null stays MAX
+    (pa.array(["\U0001F600"]), 4),  # one UTF-16 surrogate pair, four UTF-8 bytes
+    (pa.array(["x" * 4001], pa.large_string()), None),
+    (pa.array([b"x" * 5000]), 8000),  # binary columns cap at 8000, not 4000
+    (pa.array([b"x" * 8001], pa.large_binary()), None),
+])
+def test_string_column_sizes(column, expected):
+    table = pa.table({"id": pa.array([1] * len(column)), "value": column})
+
+    assert ingest.string_column_sizes(table) == {"value": expected}
+
+
+@pytest.mark.parametrize("limit, expected", [(None, True), (100, False), (5000, True)])
+def test_bulk_insert_estimate_respects_scan_limit(tmp_path, limit, expected):
+    conn = StubConnection(SAMPLE.schema.names)
+    files = [types.SimpleNamespace(file=types.SimpleNamespace(record_count=2000))] * 3
+    scan = types.SimpleNamespace(plan_files=lambda: files, limit=limit)
+    sql_cfg = {"bulk_insert_dir": str(tmp_path), "bulk_threshold": 1000}
+
+    assert ingest._use_bulk_insert(sql_cfg, scan, SAMPLE.to_reader(), conn, "[dbo].[sample]") == expected
+
+
+def test_uint64_values_above_bigint_bind_as_text():
+    table = pa.table({"big": pa.array([2**64 - 1, None, 7], pa.uint64())})
+    conn = StubConnection(["big"])
+
+    ingest.ingest_data(conn, "dbo", "sample", table, prefetch_batches=0)
+
+    assert ingest.arrow_type_to_sql(pa.uint64()) == "DECIMAL(20, 0)"
+    assert conn.bulk_copies[0][1] == [("18446744073709551615",), (None,), ("7",)]
+
+
+class StubFileTask:
+    def __init__(self, file_path):
+        self.file = types.SimpleNamespace(file_path=file_path)
+
+
+class StubParallelScan:
+    def __init__(self, file_paths):
+        self.file_paths = file_paths
+
+    def plan_files(self):
+        return [StubFileTask(path) for path in self.file_paths]
+
+    def projection(self):
+        return SAMPLE.schema
+
+    def snapshot(self):
+        return types.SimpleNamespace(snapshot_id=42)
+
+
+class StubPool:
+    """Stands in for ProcessPoolExecutor; futures of failing paths fail, the others stay pending."""
+
+    def __init__(self, failing, max_workers, initializer, initargs):
+        self.failing = failing
+        self.initargs = initargs
+        self.futures = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, file_path):
+        future = concurrent.futures.Future()
+        if file_path in self.failing:
+            future.set_exception(RuntimeError(f"cannot load {file_path}"))
+        elif not self.failing:
+            future.set_result(SAMPLE.num_rows)
+        self.futures.append(future)
+        return future
+
+
+@pytest.mark.parametrize("failing", [set(), {"b.parquet"}])
+def test_run_parallel_creates_table_once_and_cancels_on_failure(monkeypatch, failing):
+    conn = StubConnection(SAMPLE.schema.names)
+    pools = []
+
+    def pool(**kwargs):
+        pools.append(StubPool(failing, **kwargs))
+        return pools[-1]
+
+    monkeypatch.setattr(ingest, "connect_sql_server", lambda config: conn)
+    monkeypatch.setattr(ingest, "schema_to_pyarrow", lambda schema: schema)
+    monkeypatch.setattr(ingest, "ProcessPoolExecutor", pool)
+    scan = StubParallelScan(["a.parquet", "b.parquet", "c.parquet"])
+
+    with pytest.raises(RuntimeError, match="b.parquet") if failing else contextlib.nullcontext():
+        ingest.run_parallel(sql_config(), scan, workers=2)
+
+    assert sum(sql.lstrip().startswith("CREATE TABLE") for sql, _ in conn.statements) == 1
+    assert pools[0].initargs[1] == 42  # workers read the parent's snapshot
+    futures = pools[0].futures
+    if failing:
+        assert [future.cancelled() for future in futures] == [True, False, True]
+    else:
+        assert all(future.result() == SAMPLE.num_rows for future in futures)
+
+
+def test_parallel_worker_does_not_import_pandas(tmp_path, monkeypatch, request):
+    pytest.importorskip("sqlalchemy")  # backs pyiceberg's SQL catalog
+    from pyiceberg.catalog.sql import SqlCatalog
+
+    catalog_properties = {
+        "type": "sql",
+        "uri": f"sqlite:///{tmp_path / 'catalog.db'}",
+        "warehouse": (tmp_path / "warehouse").as_uri(),
+    }
+    catalog = SqlCatalog("test", **{k: v for k, v in catalog_properties.items() if k != "type"})
+    catalog.create_namespace("ns")
+    iceberg_table = catalog.create_table("ns.sample", schema=SAMPLE.schema)
+    iceberg_table.append(SAMPLE)
+    iceberg_table.append(SAMPLE)
+
+    config = sql_config()
+    config["iceberg"].update(catalog_name="test", catalog_properties=catalog_properties)
+    conn = StubConnection(SAMPLE.schema.names)
+    monkeypatch.setattr(ingest, "connect_sql_server", lambda config: conn)
+    monkeypatch.setattr(ingest, "_worker_state", {})
+    pandas_imports = request.getfixturevalue("pandas_imports")  # after building the Iceberg table
+
+    # Run the worker entry points in-process, as each pool process would
+    rows = multiprocessing.Value("q", 0)
+    ingest._init_worker(config, iceberg_table.current_snapshot().snapshot_id, rows, logging.INFO)
+    for file_path in ingest._worker_state["tasks"]:
+        ingest._ingest_file(file_path)
+
+    assert pandas_imports == []
+    assert "pandas" not in sys.modules
+    assert rows.value == 2 * SAMPLE.num_rows
+    with pytest.raises(RuntimeError, match="not in the worker's plan"):
+        ingest._ingest_file("s3://warehouse/compacted-away.parquet")